@@ -2,133 +2,219 @@ import re
 import sys
 import os
 import datetime
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+import json
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import numpy as np
 from collections import defaultdict
+from typing import NamedTuple
 
 PLOT_PRE_SECONDS  = 0.3
 PLOT_POST_SECONDS = 3
 BUCKET_MS         = 10   # bucket width for message-rate analysis
 
+# Compiled once at import time — parse_logs is called per file in directory mode.
+# One prefix-grouped pattern: the shared timestamp prefix is walked once per
+# line, then the alternation dispatches on message kind.
+# Bytes patterns: the log is mmap'd and scanned without per-line str decoding.
+_LINE_RE = re.compile(
+    rb'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - INFO - '
+    rb'(?:Stream message: (.*)'
+    rb'|Starting latency logging for (\w+) \| funding_rate=([\-0-9\.]+) \| interval=(\w+)h)'
+)
+# Captures only the fields we use (E, b, a) in the order the SDK reprs them,
+# instead of findall-ing every kv pair into a throwaway dict.
+_BOOK_FIELDS_RE = re.compile(
+    rb"e=['\"]?bookTicker['\"]?.*?\bE=(\d+).*?\bb=['\"]?([0-9\.]+).*?\ba=['\"]?([0-9\.]+)"
+)
+
+
+def _extract_book_fields(payload):
+    """Return (E, b, a) for a bookTicker payload, or None.
+
+    JSON-object payloads go through a C decoder (orjson when available);
+    SDK kv-repr payloads fall back to the tethered regex.
+    """
+    if payload.startswith(b'{'):
+        try:
+            params = orjson.loads(payload) if orjson is not None else json.loads(payload)
+        except ValueError:
+            params = None
+        if isinstance(params, dict):
+            if params.get('e') != 'bookTicker':
+                return None
+            try:
+                return int(params['E']), float(params['b']), float(params['a'])
+            except (KeyError, TypeError, ValueError):
+                return None
+
+    fields = _BOOK_FIELDS_RE.search(payload)
+    if fields:
+        return int(fields.group(1)), float(fields.group(2)), float(fields.group(3))
+    return None
 
-def parse_logs(filepath):
-    book_data = []
-    meta      = {'symbol': None, 'funding_rate': None, 'interval': None}
 
-    book_pattern = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - INFO - Stream message: (.*)')
-    meta_pattern = re.compile(
-        r'Starting latency logging for (\w+) \| funding_rate=([\-0-9\.]+) \| interval=(\w+)h'
-    )
-    kv_pattern   = re.compile(r"(\w+)=['\"]?([a-zA-Z0-9\.]+)['\"]?")
+class BookData(NamedTuple):
+    """Column-oriented book-ticker events — one packed array per field."""
+    local_ts:      np.ndarray   # local arrival time, ms epoch (float64)
+    E:             np.ndarray   # exchange event time, ms epoch (int64)
+    b:             np.ndarray   # best bid (float64)
+    a:             np.ndarray   # best ask (float64)
+    readable_time: list         # raw log timestamp strings
+
+    def __len__(self):
+        return len(self.E)
+
+
+_hour_epoch_cache: dict[str, float] = {}
+
+
+def _parse_log_ts_ms(ts: str) -> float:
+    """Epoch-ms for a 'YYYY-MM-DD HH:MM:SS,mmm' log timestamp (local time).
+
+    The format is fixed, so slicing out the integer fields beats strptime's
+    Python-level format interpretation by a wide margin. The epoch of each
+    distinct hour is cached — DST shifts land on hour boundaries, so the
+    cache stays exact.
+    """
+    hour_epoch = _hour_epoch_cache.get(ts[:13])
+    if hour_epoch is None:
+        hour_epoch = datetime.datetime(
+            int(ts[:4]), int(ts[5:7]), int(ts[8:10]), int(ts[11:13])
+        ).timestamp()
+        _hour_epoch_cache[ts[:13]] = hour_epoch
+    return (hour_epoch + int(ts[14:16]) * 60 + int(ts[17:19])) * 1000.0 + int(ts[20:23])
+
+
+def parse_logs(filepath):
+    local_ts, event_ts, bids, asks, readable = [], [], [], [], []
+    meta = {'symbol': None, 'funding_rate': None, 'interval': None}
 
     print(f"Reading {filepath}...")
     try:
-        with open(filepath, 'r') as f:
-            for line in f:
-                if meta['symbol'] is None:
-                    m = meta_pattern.search(line)
-                    if m:
-                        meta['symbol']       = m.group(1)
-                        meta['funding_rate'] = float(m.group(2))
-                        meta['interval']     = m.group(3)
-
-                match = book_pattern.search(line)
-                if match:
-                    params = dict(kv_pattern.findall(match.group(2)))
-                    if params.get('e') == 'bookTicker' and 'E' in params and 'b' in params and 'a' in params:
-                        try:
-                            log_dt = datetime.datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S,%f')
-                            book_data.append({
-                                'local_ts':      log_dt.timestamp() * 1000,
-                                'E':             int(params['E']),
-                                'b':             float(params['b']),
-                                'a':             float(params['a']),
-                                'readable_time': match.group(1),
-                            })
-                        except ValueError:
+        # mmap the file and scan bytes directly: no per-line str allocation or
+        # UTF-8 decode — only the matched timestamp is decoded.
+        # mmap rejects empty files, hence the size guard; an empty log simply
+        # yields no data.
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, 'madvise'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)   # bigger readahead for the one-pass scan
+                    for line in iter(mm.readline, b''):
+                        # O(1) guard: every parseable line starts with the
+                        # timestamp's century digits — skip the regex otherwise.
+                        if not line.startswith(b'20'):
+                            continue
+                        match = _LINE_RE.search(line)
+                        if not match:
                             continue
+
+                        payload = match.group(2)
+                        if payload is not None:
+                            fields = _extract_book_fields(payload)
+                            if fields:
+                                try:
+                                    ts_str = match.group(1).decode('ascii')
+                                    local_ts.append(_parse_log_ts_ms(ts_str))
+                                    event_ts.append(fields[0])
+                                    bids.append(fields[1])
+                                    asks.append(fields[2])
+                                    readable.append(ts_str)
+                                except ValueError:
+                                    continue
+                        elif meta['symbol'] is None:
+                            meta['symbol']       = match.group(3).decode('ascii')
+                            meta['funding_rate'] = float(match.group(4))
+                            meta['interval']     = match.group(5).decode('ascii')
     except FileNotFoundError:
         print(f"Error: File {filepath} not found.")
 
+    book_data = BookData(
+        local_ts=np.asarray(local_ts, dtype=np.float64),
+        E=np.asarray(event_ts, dtype=np.int64),
+        b=np.asarray(bids, dtype=np.float64),
+        a=np.asarray(asks, dtype=np.float64),
+        readable_time=readable,
+    )
     return book_data, meta
 
 
-def _find_clock_boundaries(timestamps):
-    t_start = timestamps[0]
-    t_end   = timestamps[-1]
-    first   = t_start.replace(second=0, microsecond=0)
-    if first < t_start:
-        first += datetime.timedelta(minutes=1)
-    boundaries, t = [], first
-    while t <= t_end:
-        boundaries.append(t)
-        t += datetime.timedelta(minutes=1)
-    return boundaries
+def _find_clock_boundaries(E_ms):
+    # Whole-minute boundaries (in ms) via floor/ceil division on epoch-ms
+    # rather than stepping a datetime one timedelta at a time.
+    start_ms = int(E_ms[0])
+    end_ms   = int(E_ms[-1])
+    return np.arange(-(-start_ms // 60_000), end_ms // 60_000 + 1, dtype=np.int64) * 60_000
 
 
-def _first_index_at_or_after(timestamps, target):
-    for i, ts in enumerate(timestamps):
-        if ts >= target:
-            return i
-    return None
+def _first_index_at_or_after(E_ms, target_ms):
+    # E_ms is sorted by construction, so binary search beats a linear scan.
+    i = int(np.searchsorted(E_ms, target_ms, side='left'))
+    return i if i < len(E_ms) else None
 
 
 # ---------------------------------------------------------------------------
 # Message-rate analysis
 # ---------------------------------------------------------------------------
 
-def _bucket_key(ts_ms: float, bucket_ms: int = BUCKET_MS) -> float:
-    """Floor a millisecond timestamp to the nearest bucket boundary."""
-    return float(int(ts_ms // bucket_ms) * bucket_ms)
-
-
-def compute_message_rate(book_data, bucket_ms: int = BUCKET_MS):
-    """
-    Count messages per bucket_ms window using the *event* timestamp (E).
-    Returns parallel lists suitable for a bar chart:
-        bucket_times  – datetime of each bucket start
-        counts        – number of messages in that bucket
-    """
-    counts: dict[float, int] = defaultdict(int)
-    for entry in book_data:
-        counts[_bucket_key(entry['E'], bucket_ms)] += 1
-
-    sorted_keys = sorted(counts)
-    bucket_times = [datetime.datetime.fromtimestamp(k / 1000) for k in sorted_keys]
-    bucket_counts = [counts[k] for k in sorted_keys]
-    return bucket_times, bucket_counts
+class BucketStats(NamedTuple):
+    """Per-bucket message stats — computed once, consumed by both the console
+    table and the message-rate subplot."""
+    start_ms: np.ndarray   # epoch-ms of each occupied bucket start
+    counts:   np.ndarray   # messages in the bucket
+    means:    np.ndarray   # mean latency in the bucket (ms)
+    maxes:    np.ndarray   # max latency in the bucket (ms)
+
+
+def _bucket_stats(E_ms, latencies, bucket_ms: int = BUCKET_MS) -> BucketStats:
+    # Single vectorized group-by on bucket id: sums/counts via bincount,
+    # per-bucket max via reduceat over the stably-sorted latency array.
+    ids      = E_ms // bucket_ms
+    base     = int(ids.min())
+    ids      = (ids - base).astype(np.int64)
+    n_bins   = int(ids.max()) + 1
+
+    counts   = np.bincount(ids, minlength=n_bins)
+    sums     = np.bincount(ids, weights=latencies, minlength=n_bins)
+    occupied = np.nonzero(counts)[0]
+
+    order = np.argsort(ids, kind='stable')
+    edges = np.searchsorted(ids[order], occupied)
+
+    bucket_counts = counts[occupied]
+    return BucketStats(
+        start_ms=(occupied + base) * bucket_ms,
+        counts=bucket_counts,
+        means=sums[occupied] / bucket_counts,
+        maxes=np.maximum.reduceat(latencies[order], edges),
+    )
 
 
-def print_message_rate_stats(book_data, latencies, timestamps, bucket_ms: int = BUCKET_MS):
+def print_message_rate_stats(stats: BucketStats, bucket_ms: int = BUCKET_MS):
     """
     Print a table of every bucket, its message count, and the max / mean latency
     observed inside it.  Highlights buckets where both count and latency are elevated.
     """
-    from collections import defaultdict
-
-    bucket_latencies: dict[float, list[float]] = defaultdict(list)
-    for entry, lat in zip(book_data, latencies):
-        bucket_latencies[_bucket_key(entry['E'], bucket_ms)].append(lat)
-
-    sorted_keys = sorted(bucket_latencies)
+    bucket_counts = stats.counts
+    bucket_means  = stats.means
 
     # Global baseline (median latency across all buckets' means)
-    all_means = [np.mean(v) for v in bucket_latencies.values()]
-    baseline  = float(np.median(all_means))
-    global_count_mean = np.mean([len(v) for v in bucket_latencies.values()])
+    baseline          = float(np.median(bucket_means))
+    global_count_mean = float(bucket_counts.mean())
 
     print("\n" + "=" * 70)
     print(f"Message-rate analysis  (bucket = {bucket_ms} ms,  baseline latency ≈ {baseline:.1f} ms)")
     print(f"{'Bucket':>23}  {'Count':>5}  {'MaxLat':>8}  {'MeanLat':>8}  {'Flag'}")
     print("-" * 70)
 
-    for k in sorted_keys:
-        lats   = bucket_latencies[k]
-        count  = len(lats)
-        max_l  = max(lats)
-        mean_l = np.mean(lats)
-        dt_str = datetime.datetime.fromtimestamp(k / 1000).strftime('%H:%M:%S.%f')[:-3]
+    for start_ms, count, max_l, mean_l in zip(stats.start_ms.tolist(), bucket_counts, stats.maxes, bucket_means):
+        dt_str = datetime.datetime.fromtimestamp(start_ms / 1000).strftime('%H:%M:%S.%f')[:-3]
 
         # Flag buckets where latency is elevated (>2× baseline) AND message count is also elevated
         high_lat   = mean_l > baseline * 1.2
@@ -144,9 +230,7 @@ def print_message_rate_stats(book_data, latencies, timestamps, bucket_ms: int =
         print(f"  {dt_str:>21}  {count:>5}  {max_l:>8.1f}  {mean_l:>8.1f}  {flag}")
 
     # --- Correlation summary ---
-    counts_arr   = np.array([len(bucket_latencies[k]) for k in sorted_keys], dtype=float)
-    mean_lats    = np.array([np.mean(bucket_latencies[k]) for k in sorted_keys], dtype=float)
-    corr         = float(np.corrcoef(counts_arr, mean_lats)[0, 1]) if len(counts_arr) > 1 else float('nan')
+    corr = float(np.corrcoef(bucket_counts.astype(float), bucket_means)[0, 1]) if len(bucket_counts) > 1 else float('nan')
 
     print("-" * 70)
     print(f"Pearson correlation (msg count vs mean latency): {corr:+.5f}")
@@ -163,50 +247,93 @@ def print_message_rate_stats(book_data, latencies, timestamps, bucket_ms: int =
 # Plot
 # ---------------------------------------------------------------------------
 
+_DECIMATE_TARGET_PTS = 1400   # ≈ horizontal pixels of the figure (14 in × 100 dpi)
+
+
+def _decimate(x, y, target_pts: int = _DECIMATE_TARGET_PTS):
+    """Min/max downsample a series to ~2 points per horizontal pixel.
+
+    The rendered envelope is unchanged — each bin contributes its min and max
+    — but matplotlib walks O(pixels) segments instead of O(points). Short
+    series are returned as-is.
+    """
+    n = len(x)
+    if n < 4 * target_pts:
+        return x, y
+
+    edges  = np.linspace(0, n, target_pts + 1, dtype=np.int64)
+    starts = edges[:-1]
+    mids   = np.minimum(starts + (np.diff(edges) // 2), n - 1)
+
+    xs = np.empty(target_pts * 2, dtype=x.dtype)
+    ys = np.empty(target_pts * 2, dtype=np.float64)
+    xs[0::2] = x[starts]
+    xs[1::2] = x[mids]
+    ys[0::2] = np.minimum.reduceat(y, starts)
+    ys[1::2] = np.maximum.reduceat(y, starts)
+    return xs, ys
+
+
 def analyze_and_plot(book_data, output_plot_path=None, meta=None):
-    if not book_data:
+    if not len(book_data):
         print("No valid 'bookTicker' data found in logs.")
         return
 
-    timestamps, latencies, bids, asks = [], [], [], []
-
-    for i, entry in enumerate(book_data):
-        latency = entry['local_ts'] - entry['E']
-        timestamps.append(datetime.datetime.fromtimestamp(entry['E'] / 1000))
-        latencies.append(latency)
-        bids.append(entry['b'])
-        asks.append(entry['a'])
+    # Deferred import: parse-only callers and empty logs never pay the
+    # several-hundred-ms matplotlib import.
+    import matplotlib
+    matplotlib.use('Agg')   # headless raster backend — much faster for batch saves
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
+    # SoA: one vectorized subtract instead of a Python loop per event.
+    latencies = book_data.local_ts - book_data.E
+    bids      = book_data.b
+    asks      = book_data.a
+
+    # Stay in epoch-ms throughout; matplotlib takes the datetime64 view
+    # directly, so no per-event datetime object is ever built. The constant
+    # UTC offset keeps axis labels in local time like before.
+    utc_offset_ms = int(
+        datetime.datetime.fromtimestamp(book_data.E[0] / 1000).astimezone().utcoffset().total_seconds() * 1000
+    )
+    E_local_ms   = book_data.E + utc_offset_ms
+    timestamps64 = E_local_ms.astype('datetime64[ms]')
 
     # --- x-axis window (computed before max latency search) ---
-    clock_boundaries = _find_clock_boundaries(timestamps)
-    if clock_boundaries:
-        anchor = clock_boundaries[0]
-        x_min  = anchor - datetime.timedelta(seconds=PLOT_PRE_SECONDS)
-        x_max  = anchor + datetime.timedelta(seconds=PLOT_POST_SECONDS)
+    boundaries_ms = _find_clock_boundaries(E_local_ms)
+    if len(boundaries_ms):
+        anchor_ms = int(boundaries_ms[0])
+        x_min_ms  = anchor_ms - int(PLOT_PRE_SECONDS * 1000)
+        x_max_ms  = anchor_ms + int(PLOT_POST_SECONDS * 1000)
     else:
-        x_min, x_max = timestamps[0], timestamps[-1]
-
-    # --- Max latency within the plot window only ---
-    max_latency, max_latency_idx = -float('inf'), -1
-    for i, (ts, lat) in enumerate(zip(timestamps, latencies)):
-        if x_min <= ts <= x_max and lat > max_latency:
-            max_latency, max_latency_idx = lat, i
+        x_min_ms, x_max_ms = int(E_local_ms[0]), int(E_local_ms[-1])
+    x_min = np.datetime64(x_min_ms, 'ms')
+    x_max = np.datetime64(x_max_ms, 'ms')
+
+    # --- Max latency within the plot window only (vectorized mask + argmax) ---
+    window = (E_local_ms >= x_min_ms) & (E_local_ms <= x_max_ms)
+    if window.any():
+        max_latency_idx = int(np.where(window, latencies, -np.inf).argmax())
+        max_latency     = float(latencies[max_latency_idx])
+    else:
+        max_latency, max_latency_idx = -float('inf'), -1
 
     # --- Stats ---
     print("-" * 50)
     if max_latency_idx != -1:
-        e = book_data[max_latency_idx]
         print(f"Max Latency (Local - Event): {max_latency:.2f} ms")
-        print(f"  Local Log Time : {e['readable_time']}")
-        print(f"  Event Time (E) : {e['E']}")
+        print(f"  Local Log Time : {book_data.readable_time[max_latency_idx]}")
+        print(f"  Event Time (E) : {book_data.E[max_latency_idx]}")
     print("-" * 50)
 
-    # --- Message-rate stats (console) ---
-    print_message_rate_stats(book_data, latencies, timestamps)
+    # --- Message-rate stats: one group-by shared by console table and plot ---
+    stats = _bucket_stats(book_data.E, latencies)
+    print_message_rate_stats(stats)
 
-    # --- Message-rate data for plot ---
-    bucket_times, bucket_counts = compute_message_rate(book_data)
-    bucket_width_dt = datetime.timedelta(milliseconds=BUCKET_MS * 0.85)  # slight gap between bars
+    bucket_counts     = stats.counts
+    bucket_times64    = (stats.start_ms + utc_offset_ms).astype('datetime64[ms]')
+    bucket_width_days = BUCKET_MS * 0.85 / 86_400_000  # date axis is in days; slight gap between bars
 
     # --- Plot (3 subplots) ---
     plt.style.use('ggplot')
@@ -227,14 +354,14 @@ def analyze_and_plot(book_data, output_plot_path=None, meta=None):
         has_suptitle = True
 
     # Subplot 1: Bid + Ask price
-    ax1.plot(timestamps, bids, label='Bid', color='green', linewidth=1.5, alpha=0.8)
-    ax1.plot(timestamps, asks, label='Ask', color='red',   linewidth=1.5, alpha=0.8)
+    ax1.plot(*_decimate(timestamps64, bids), label='Bid', color='green', linewidth=1.5, alpha=0.8, rasterized=True)
+    ax1.plot(*_decimate(timestamps64, asks), label='Ask', color='red',   linewidth=1.5, alpha=0.8, rasterized=True)
     ax1.set_ylabel('Price')
     ax1.set_title('Bid / Ask Price')
     ax1.grid(True, linestyle=':', alpha=0.6)
 
     # Subplot 2: Latency
-    ax2.plot(timestamps, latencies, label='Latency (Local − Event)', color='purple', linewidth=1.5)
+    ax2.plot(*_decimate(timestamps64, latencies), label='Latency (Local − Event)', color='purple', linewidth=1.5, rasterized=True)
     ax2.set_ylabel('Latency (ms)', color='purple')
     ax2.tick_params(axis='y', labelcolor='purple')
     ax2.set_title('Latency (Local − Event Time)')
@@ -243,8 +370,8 @@ def analyze_and_plot(book_data, output_plot_path=None, meta=None):
     # Subplot 3: Messages per 100ms bucket
     bar_colors = ['crimson' if c > np.mean(bucket_counts) * 1.5 else 'steelblue'
                   for c in bucket_counts]
-    ax3.bar(bucket_times, bucket_counts, width=bucket_width_dt,
-            color=bar_colors, alpha=0.8, label=f'Msgs per {BUCKET_MS}ms')
+    ax3.bar(bucket_times64, bucket_counts, width=bucket_width_days,
+            color=bar_colors, alpha=0.8, label=f'Msgs per {BUCKET_MS}ms', rasterized=True)
     ax3.axhline(y=np.mean(bucket_counts), color='gray', linewidth=1.0,
                 linestyle='--', label=f'Mean ({np.mean(bucket_counts):.1f})')
     ax3.set_ylabel('Msg count')
@@ -254,20 +381,20 @@ def analyze_and_plot(book_data, output_plot_path=None, meta=None):
 
     # Orange vertical line at max latency + bid horizontal after it
     if max_latency_idx != -1:
-        max_local_dt = datetime.datetime.fromtimestamp(book_data[max_latency_idx]['local_ts'] / 1000)
+        max_local_dt = np.datetime64(int(book_data.local_ts[max_latency_idx]) + utc_offset_ms, 'ms')
         for ax in (ax1, ax2, ax3):
             ax.axvline(x=max_local_dt, color='orange', linewidth=1.5, linestyle='--', label='Max Latency')
         ax2.annotate(
             f'Max: {max_latency:.2f}ms',
-            xy=(timestamps[max_latency_idx], latencies[max_latency_idx]),
+            xy=(timestamps64[max_latency_idx], latencies[max_latency_idx]),
             xytext=(-10, 20), textcoords='offset points',
             arrowprops=dict(arrowstyle="->", color='purple'),
             bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="purple", alpha=0.8),
         )
         post_max_idx = max_latency_idx + 1
-        if post_max_idx < len(timestamps):
+        if post_max_idx < len(timestamps64):
             post_max_bid = bids[post_max_idx]
-            hline_start  = max(timestamps[post_max_idx], x_min)
+            hline_start  = max(timestamps64[post_max_idx], x_min)
             hline_end    = min(x_max, x_max)
             ax1.hlines(y=post_max_bid, xmin=hline_start, xmax=hline_end,
                        color='orange', linewidth=1.2, linestyle='--', alpha=0.9,
@@ -275,42 +402,53 @@ def analyze_and_plot(book_data, output_plot_path=None, meta=None):
             ax1.text(hline_start, post_max_bid, f'{post_max_bid:.5f}',
                      fontsize=7, color='orange', verticalalignment='bottom')
 
-    # Clock minute boundaries + bid horizontal at first point after each
-    for clock_minute in clock_boundaries:
-        for ax in (ax1, ax2, ax3):
-            ax.axvline(x=clock_minute, color='blue', linewidth=1.0, linestyle=':', alpha=0.7)
+    # Clock minute boundaries + bid horizontal at first point after each.
+    # Accumulate coordinates per kind and draw one vlines/hlines artist each
+    # instead of one axvline/hlines per minute per axis.
+    plus200_ms = boundaries_ms + 200
 
-        # Vertical line at 200ms after the clock boundary
-        clock_plus_200ms = clock_minute + datetime.timedelta(milliseconds=200)
-        for ax in (ax1, ax2, ax3):
-            ax.axvline(x=clock_plus_200ms, color='lime', linewidth=1.0, linestyle='--', alpha=0.8)
-        ax2.text(clock_plus_200ms, ax2.get_ylim()[0], '+200ms',
-                 rotation=90, fontsize=7, color='lime', verticalalignment='bottom')
+    bid200_ys, bid200_x0s, bid200_x1s = [], [], []
+    entry_ys,  entry_x0s,  entry_x1s  = [], [], []
+
+    for clock_minute_ms, clock_plus_200_ms in zip(boundaries_ms.tolist(), plus200_ms.tolist()):
+        next_minute_ms = clock_minute_ms + 60_000
 
-        # Horizontal line on bid/ask at the first point at or after +200ms
-        j200 = _first_index_at_or_after(timestamps, clock_plus_200ms)
+        # Bid at the first point at or after +200ms
+        j200 = _first_index_at_or_after(E_local_ms, clock_plus_200_ms)
         if j200 is not None:
-            bid_200 = bids[j200]
-            next_minute = clock_minute + datetime.timedelta(minutes=1)
-            hline_start = max(clock_plus_200ms, x_min)
-            hline_end   = min(next_minute, x_max)
-            ax1.hlines(y=bid_200, xmin=hline_start, xmax=hline_end,
-                       color='lime', linewidth=1.2, linestyle='--', alpha=0.9,
-                       label='+200ms Bid' if clock_minute == clock_boundaries[0] else '')
-            ax1.text(hline_start, bid_200, f'{bid_200:.5f}',
-                     fontsize=7, color='lime', verticalalignment='bottom')
-
-        j = _first_index_at_or_after(timestamps, clock_minute)
+            bid200_ys.append(bids[j200])
+            bid200_x0s.append(np.datetime64(max(clock_plus_200_ms, x_min_ms), 'ms'))
+            bid200_x1s.append(np.datetime64(min(next_minute_ms, x_max_ms), 'ms'))
+
+        # Bid at the first point at or after the boundary itself
+        j = _first_index_at_or_after(E_local_ms, clock_minute_ms)
         if j is not None:
-            entry_bid   = bids[j]
-            next_minute = clock_minute + datetime.timedelta(minutes=1)
-            hline_start = max(clock_minute, x_min)
-            hline_end   = min(next_minute, x_max)
-            ax1.hlines(y=entry_bid, xmin=hline_start, xmax=hline_end,
-                       color='blue', linewidth=1.2, linestyle='--', alpha=0.9,
-                       label='Bid at Settlement' if clock_minute == clock_boundaries[0] else '')
-            ax1.text(hline_start, entry_bid, f'{entry_bid:.5f}',
-                     fontsize=7, color='blue', verticalalignment='bottom')
+            entry_ys.append(bids[j])
+            entry_x0s.append(np.datetime64(max(clock_minute_ms, x_min_ms), 'ms'))
+            entry_x1s.append(np.datetime64(min(next_minute_ms, x_max_ms), 'ms'))
+
+    if len(boundaries_ms):
+        boundaries64 = boundaries_ms.astype('datetime64[ms]')
+        plus200_64   = plus200_ms.astype('datetime64[ms]')
+        for ax in (ax1, ax2, ax3):
+            ymin, ymax = ax.get_ylim()
+            ax.vlines(boundaries64, ymin, ymax, color='blue', linewidth=1.0, linestyle=':', alpha=0.7)
+            ax.vlines(plus200_64, ymin, ymax, color='lime', linewidth=1.0, linestyle='--', alpha=0.8)
+        for clock_plus_200 in plus200_64:
+            ax2.text(clock_plus_200, ax2.get_ylim()[0], '+200ms',
+                     rotation=90, fontsize=7, color='lime', verticalalignment='bottom')
+
+    if bid200_ys:
+        ax1.hlines(y=bid200_ys, xmin=bid200_x0s, xmax=bid200_x1s,
+                   color='lime', linewidth=1.2, linestyle='--', alpha=0.9, label='+200ms Bid')
+        for x0, y in zip(bid200_x0s, bid200_ys):
+            ax1.text(x0, y, f'{y:.5f}', fontsize=7, color='lime', verticalalignment='bottom')
+
+    if entry_ys:
+        ax1.hlines(y=entry_ys, xmin=entry_x0s, xmax=entry_x1s,
+                   color='blue', linewidth=1.2, linestyle='--', alpha=0.9, label='Bid at Settlement')
+        for x0, y in zip(entry_x0s, entry_ys):
+            ax1.text(x0, y, f'{y:.5f}', fontsize=7, color='blue', verticalalignment='bottom')
 
     for ax in (ax1, ax2, ax3):
         ax.set_xlim(x_min, x_max)
@@ -325,11 +463,21 @@ def analyze_and_plot(book_data, output_plot_path=None, meta=None):
 
     if output_plot_path:
         os.makedirs(os.path.dirname(output_plot_path), exist_ok=True)
-        plt.savefig(output_plot_path)
+        fig.savefig(output_plot_path)
         print(f"Plot saved to {output_plot_path}")
-        plt.close()
     else:
         plt.show()
+    # Always release the figure — directory mode renders many in one process
+    plt.close(fig)
+
+
+def _process_one(filepath):
+    """Parse one log file and render its plot — independent per file, so
+    directory mode can fan these out across worker processes."""
+    book_data, meta = parse_logs(filepath)
+    plot_filename = os.path.basename(filepath).replace('.txt', '.png')
+    plot_path = os.path.join('Plots', plot_filename)
+    analyze_and_plot(book_data, plot_path, meta=meta)
 
 
 if __name__ == "__main__":
@@ -337,10 +485,7 @@ if __name__ == "__main__":
 
     if os.path.isfile(target):
         # Called with a single log file (e.g. from streams.py subprocess)
-        book_data, meta = parse_logs(target)
-        plot_filename = os.path.basename(target).replace('.txt', '.png')
-        plot_path = os.path.join('Plots', plot_filename)
-        analyze_and_plot(book_data, plot_path, meta=meta)
+        _process_one(target)
     else:
         # Called with a directory — process all .txt files inside it
         log_files = sorted(f for f in os.listdir(target) if f.endswith('.txt'))
@@ -349,9 +494,8 @@ if __name__ == "__main__":
             print(f"No .txt log files found in {target}")
             sys.exit(0)
 
-        for filename in log_files:
-            filepath = os.path.join(target, filename)
-            book_data, meta = parse_logs(filepath)
-            plot_filename = filename.replace('.txt', '.png')
-            plot_path = os.path.join('Plots', plot_filename)
-            analyze_and_plot(book_data, plot_path, meta=meta)
+        filepaths = [os.path.join(target, f) for f in log_files]
+        # Each file is parse+render independent; Agg is selected before the
+        # pyplot import so workers never touch a GUI backend.
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(_process_one, filepaths))
@@ -1,8 +1,8 @@
 import asyncio
 import logging
 import logging.handlers
-import configparser
 import datetime
+import time
 from binance_common.configuration import ConfigurationWebSocketAPI, ConfigurationWebSocketStreams, WebsocketMode
 from binance_common.constants import (
     DERIVATIVES_TRADING_USDS_FUTURES_WS_API_TESTNET_URL,
@@ -14,7 +14,15 @@ from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futur
 
 from streams import start_funding_rate_stream, run_logging_session
 import streams
-from utils import console_listener
+from utils import console_listener, get_config
+
+# uvloop's C event loop trims per-callback overhead in the WS handlers;
+# optional — the stock selector loop works everywhere uvloop does not.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,9 +30,8 @@ logging.basicConfig(
     handlers=[logging.handlers.QueueHandler(console_listener.queue)]
 )
 
-# Read config.ini
-config = configparser.ConfigParser()
-config.read("config.ini")
+# Read config.ini (parsed once, shared across modules)
+config = get_config()
 
 api_key     = config.get("live_auth", "api_key")
 private_key = config.get("live_auth", "private_key")
@@ -52,13 +59,35 @@ client = DerivativesTradingUsdsFutures(
 )
 
 
-def _is_pre_settlement(now: datetime.datetime, interval_hours: int | None) -> bool:
-    """Returns True if now is x:59:30 where (current hour + 1) is a settlement hour for the given interval."""
-    if not interval_hours:
+def _next_pre_settlement(now: datetime.datetime, intervals: set) -> datetime.datetime:
+    """Earliest upcoming x:59:30 whose following hour settles for any cached
+    interval. Falls back to the next hourly x:59:30 while no interval info
+    has been cached yet."""
+    target = now.replace(minute=59, second=30, microsecond=0)
+    if target <= now:
+        target += datetime.timedelta(hours=1)
+    if intervals:
+        allowed = frozenset().union(
+            *(_SETTLEMENT_HOURS.get(i) or frozenset(range(0, 24, i)) for i in intervals)
+        )
+        while ((target.hour + 1) % 24) not in allowed:
+            target += datetime.timedelta(hours=1)
+    return target
+
+
+# Precomputed at import for the funding intervals Binance actually uses;
+# unusual intervals are derived once and cached on first sight.
+_SETTLEMENT_HOURS: dict[int, frozenset] = {h: frozenset(range(0, 24, h)) for h in (1, 2, 4, 8)}
+
+
+def _is_pre_settlement(hour: int, minute: int, second: int, interval_hours: int | None) -> bool:
+    """Returns True at x:59:30 where (hour + 1) is a settlement hour for the given interval."""
+    if second != 30 or minute != 59 or not interval_hours:
         return False
-    settlement_hours = set(range(0, 24, interval_hours))
-    next_hour = (now.hour + 1) % 24
-    return next_hour in settlement_hours and now.minute == 59 and now.second == 30
+    hours = _SETTLEMENT_HOURS.get(interval_hours)
+    if hours is None:
+        hours = _SETTLEMENT_HOURS[interval_hours] = frozenset(range(0, 24, interval_hours))
+    return (hour + 1) % 24 in hours
 
 
 async def scheduler():
@@ -71,20 +100,34 @@ async def scheduler():
         logging.info(f"Funding rate data received ({len(streams.funding_rates)} symbols). Scheduler running...")
 
         while True:
-            now = datetime.datetime.now()
-
+            # Sleep straight to the next relevant x:59:30 instead of polling:
+            # one bulk sleep to just short of the deadline, then a short
+            # drift-corrected hop onto it.
+            # The target is resolved to an epoch once; the sleeps below work
+            # on plain floats rather than re-building datetimes per hop.
+            now       = datetime.datetime.now()
+            target_ts = _next_pre_settlement(now, set(streams.cached_intervals.values())).timestamp()
+            delay     = target_ts - time.time()
+            if delay > 0.05:
+                await asyncio.sleep(delay - 0.05)
+            remaining = target_ts - time.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+
+            # One clock read for the whole symbol sweep
+            lt = time.localtime()
             symbols_to_log = [
                 s for s in streams.qualifying_symbols()
-                if _is_pre_settlement(now, streams.cached_intervals.get(s, streams.cached_interval))
+                if _is_pre_settlement(lt.tm_hour, lt.tm_min, lt.tm_sec,
+                                      streams.cached_intervals.get(s, streams.cached_interval))
             ]
 
             if symbols_to_log:
                 logging.info(f"Settlement in 30s for {len(symbols_to_log)} symbol(s): {symbols_to_log}. Starting logging sessions.")
                 await asyncio.gather(*(run_logging_session(client, s, 60) for s in symbols_to_log))
-                # Sleep until the next whole second so we don't re-trigger on the same tick
-                await asyncio.sleep(1 - datetime.datetime.now().microsecond / 1_000_000)
-            else:
-                await asyncio.sleep(0.1)
+
+            # Step past this :59:30 tick so we don't re-trigger on the same second
+            await asyncio.sleep(1 - (time.time() % 1))
 
     except Exception as e:
         logging.error(f"Scheduler failed: {e}")
@@ -1,12 +1,12 @@
-import configparser
 import time
 from binance_common.configuration import ConfigurationRestAPI
 from binance_common.constants import DERIVATIVES_TRADING_USDS_FUTURES_REST_API_PROD_URL
 from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import DerivativesTradingUsdsFutures
 
+from utils import get_config
+
 try:
-    config = configparser.ConfigParser()
-    config.read('config.ini')
+    config = get_config()
     api_key = config.get("paper_auth", 'api_key')
     private_key = config.get("paper_auth", 'private_key')
 
@@ -17,6 +17,15 @@ try:
     )
     client = DerivativesTradingUsdsFutures(config_rest_api=rest_config)
 
+    # Pin a single keep-alive connection for the whole sampling run so the
+    # 50ms gaps between samples never trigger a TCP/TLS reconnect — later
+    # samples then measure pure network RTT instead of handshake outliers.
+    _session = getattr(client.rest_api, "session", None) or getattr(client.rest_api, "_session", None)
+    if _session is not None and hasattr(_session, "mount"):
+        from requests.adapters import HTTPAdapter
+        _session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        _session.headers["Connection"] = "keep-alive"
+
     best_offset = None
     best_rtt = None
     rtts = []
@@ -27,29 +36,31 @@ try:
     # Warmup request to establish TCP/TLS connection before sampling
     client.rest_api.check_server_time()
 
+    # All arithmetic in integer nanoseconds: time_ns() keeps the clock's full
+    # resolution and avoids float rounding in the midpoint/offset estimates.
     for i in range(20):
-        t0 = int(time.time() * 1000)
+        t0 = time.time_ns()
         resp = client.rest_api.check_server_time()
-        t1 = int(time.time() * 1000)
-        server_time = resp.data().server_time
-        rtt = t1 - t0
-        midpoint = (t0 + t1) // 2
-        offset = server_time - midpoint
-        rtts.append(rtt)
-        offsets.append(offset)
-        if best_rtt is None or rtt < best_rtt:
-            best_rtt = rtt
-            best_offset = offset
-        print(f"  [{i+1:2}] RTT={rtt}ms  offset={offset:+}ms")
+        t1 = time.time_ns()
+        server_time_ns = resp.data().server_time * 1_000_000   # server reports ms
+        rtt_ns = t1 - t0
+        midpoint_ns = (t0 + t1) // 2
+        offset_ns = server_time_ns - midpoint_ns
+        rtts.append(rtt_ns)
+        offsets.append(offset_ns)
+        if best_rtt is None or rtt_ns < best_rtt:
+            best_rtt = rtt_ns
+            best_offset = offset_ns
+        print(f"  [{i+1:2}] RTT={rtt_ns / 1e6:.3f}ms  offset={offset_ns / 1e6:+.3f}ms")
         time.sleep(0.05)
 
     print()
-    print(f"RTT     - min: {min(rtts)}ms  max: {max(rtts)}ms  avg: {sum(rtts)//len(rtts)}ms")
-    print(f"Offset  - best (min-RTT sample): {best_offset:+}ms")
-    print(f"Offset  - avg across all samples: {sum(offsets)//len(offsets):+}ms")
+    print(f"RTT     - min: {min(rtts) / 1e6:.3f}ms  max: {max(rtts) / 1e6:.3f}ms  avg: {sum(rtts) / len(rtts) / 1e6:.3f}ms")
+    print(f"Offset  - best (min-RTT sample): {best_offset / 1e6:+.3f}ms")
+    print(f"Offset  - avg across all samples: {sum(offsets) / len(offsets) / 1e6:+.3f}ms")
     print()
     direction = "behind" if best_offset > 0 else "ahead of"
-    print(f"=> Your local clock is {abs(best_offset)}ms {direction} Binance server time")
+    print(f"=> Your local clock is {abs(best_offset) / 1e6:.3f}ms {direction} Binance server time")
 
 except Exception as e:
     import traceback
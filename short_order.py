@@ -1,7 +1,6 @@
 import asyncio
 import logging
 import logging.handlers
-import configparser
 import datetime
 import os
 import time
@@ -16,7 +15,14 @@ from binance_common.constants import (
 from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import DerivativesTradingUsdsFutures
 from binance_sdk_derivatives_trading_usds_futures.websocket_api.models import NewOrderSideEnum
 
-from utils import setup_async_logger, console_listener, aprint
+from utils import setup_async_logger, console_listener, aprint, get_config
+
+# Optional: uvloop reduces event-loop latency around the order send
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 # ----------------------------
 # Config / constants
@@ -25,6 +31,9 @@ SYMBOL          = "AZTECUSDT"
 QUANTITY        = "1000"
 LOG_DIR         = "Logs"
 
+# Resolved once — enum lookup stays out of the fire path
+ORDER_SIDE_SELL = NewOrderSideEnum["SELL"].value
+
 TARGET_HOUR     = 1    # Set target time here
 TARGET_MINUTE   = 0
 TARGET_SECOND   = 0
@@ -42,8 +51,7 @@ logging.basicConfig(
 # ----------------------------
 # Read config.ini
 # ----------------------------
-config = configparser.ConfigParser()
-config.read("config.ini")
+config = get_config()
 api_key      = config.get("live_auth", "api_key")
 private_key  = config.get("live_auth", "private_key")
 
@@ -70,6 +78,20 @@ client = DerivativesTradingUsdsFutures(
 )
 
 
+def _wait_until_ns(target_epoch_ns: int) -> None:
+    """Block until the wall-clock instant `target_epoch_ns` with minimal jitter.
+
+    clock_nanosleep with an absolute deadline parks the thread until the
+    kernel wakes it ~200 µs early instead of pegging a core; the short spin
+    covers the final stretch. Falls back to a plain spin where the Linux
+    clock_nanosleep API is unavailable.
+    """
+    if hasattr(time, "clock_nanosleep"):
+        time.clock_nanosleep(time.CLOCK_REALTIME, time.TIMER_ABSTIME, target_epoch_ns - 200_000)
+    while time.time_ns() < target_epoch_ns:
+        pass
+
+
 def _next_target_time() -> datetime.datetime:
     """Return the next upcoming HH:MM:SS.mmm today (or tomorrow if already past)."""
     now    = datetime.datetime.now()
@@ -87,33 +109,37 @@ async def new_order():
 
     try:
         while True:
-            target_time = _next_target_time()
+            target_time     = _next_target_time()
+            target_epoch_ns = int(target_time.timestamp() * 1_000_000_000)   # computed once per cycle
 
             log_filename = os.path.join(LOG_DIR, f"order_{SYMBOL}_{target_time.strftime('%Y%m%d_%H%M%S')}.txt")
             logger, listener = setup_async_logger(log_filename)
             listener.start()
-            aprint(f"Next order scheduled at: {int(target_time.timestamp() * 1000)} ({target_time.isoformat()})")
-
-            # Coarse sleep until 50ms before target
-            coarse_wait = (target_time - datetime.datetime.now()).total_seconds() - 0.05
+            aprint(f"Next order scheduled at: {target_epoch_ns // 1_000_000} ({target_time.isoformat()})")
+
+            # Build the full order payload during the wait window; at fire
+            # time only the SDK call (timestamping + signing + send) remains.
+            order_kwargs = {
+                "symbol":   SYMBOL,
+                "side":     ORDER_SIDE_SELL,
+                "type":     "MARKET",
+                "quantity": QUANTITY,
+            }
+
+            # Coarse sleep until 50ms before target — plain epoch arithmetic,
+            # no datetime construction per cycle
+            coarse_wait = (target_epoch_ns - time.time_ns()) / 1e9 - 0.05
             if coarse_wait > 0:
                 await asyncio.sleep(coarse_wait)
 
-            # Busy-wait the final 50ms
-            target_epoch_s = target_time.timestamp()
-            while time.time() < target_epoch_s:
-                pass
+            # High-resolution timed wait for the final 50ms (no busy spin)
+            _wait_until_ns(target_epoch_ns)
 
             # Fire
             send_time = time.time()
             logger.info(f"Order sent at: {int(send_time * 1000)}")
 
-            response = await connection.new_order(
-                symbol=SYMBOL,
-                side=NewOrderSideEnum["SELL"].value,
-                type="MARKET",
-                quantity=QUANTITY,
-            )
+            response = await connection.new_order(**order_kwargs)
 
             recv_time  = time.time()
             latency_ms = (recv_time - send_time) * 1000
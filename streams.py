@@ -1,23 +1,42 @@
 import asyncio
 import logging
 import datetime
+import operator
 import os
-import subprocess
-import sys
+import time
 
-from utils import setup_async_logger, capture_stream_record, print_qualifying_funding_rates
+from utils import setup_async_logger, make_stream_recorder, print_qualifying_funding_rates
 
 FUNDING_RATE_THRESHOLD = -0.003   # log any symbol whose rate is below this
 
 # Tracks the latest funding rate per symbol from the mark price stream
 funding_rates: dict[str, float] = {}
 
+# Symbols currently below the threshold, maintained in-place per update
+_qualifying: set[str] = set()
+
+# Running minimum over funding_rates, updated incrementally per message;
+# a full rescan happens only when the current minimum moves up.
+most_negative_rate: float = float("inf")
+
 # Cache for funding rate interval info  (symbol -> interval hours)
 cached_intervals: dict[str, int] = {}
 
 _last_print_minute: int | None = None
 _last_refresh_minute: int | None = None
 
+# Bound once — the mark-price handler reads these per entry on every tick
+_get_sr = operator.attrgetter("s", "r")
+
+# Captured when the funding stream starts; WS callbacks may fire off-loop, so
+# work is handed back to the loop thread-safely instead of get_event_loop().
+_loop: asyncio.AbstractEventLoop | None = None
+
+# One WS streams connection shared by the funding stream and every logging
+# session — subscriptions ride the warm connection instead of paying a
+# TLS + WS handshake per session.
+_shared_conn = None
+
 # --- legacy aliases kept for any code that still references them ---
 cached_interval: int | None = None
 most_negative_symbol: str = ""
@@ -25,36 +44,47 @@ most_negative_symbol: str = ""
 
 def qualifying_symbols() -> list[str]:
     """Return all symbols whose current funding rate is below the threshold."""
-    return [s for s, r in funding_rates.items() if r < FUNDING_RATE_THRESHOLD]
+    return list(_qualifying)
+
+
+# One REST call refreshes every symbol's interval; per-symbol fetches fanned
+# out to hundreds of identical requests at the xx:50 refresh window.
+_INTERVAL_CACHE_TTL = 3600.0   # seconds
+_interval_cache_ts: float = 0.0
+_refresh_in_flight = False
 
 
-def _get_funding_interval(client, symbol: str) -> int | None:
+def _refresh_interval_cache(client) -> None:
+    """Fetch funding rate info once and index every symbol's interval hours."""
+    global cached_interval, _interval_cache_ts, _refresh_in_flight
     try:
         info_response = client.rest_api.get_funding_rate_info()
         info_list = info_response.data() if hasattr(info_response, "data") else info_response
         if isinstance(info_list, list):
             for item in info_list:
-                item_symbol = item.get("symbol") if isinstance(item, dict) else getattr(item, "symbol", None)
-                if item_symbol == symbol:
-                    return item.get("fundingIntervalHours") if isinstance(item, dict) else getattr(item, "funding_interval_hours", None)
+                if isinstance(item, dict):
+                    symbol   = item.get("symbol")
+                    interval = item.get("fundingIntervalHours")
+                else:
+                    symbol   = getattr(item, "symbol", None)
+                    interval = getattr(item, "funding_interval_hours", None)
+                if symbol and interval is not None:
+                    cached_intervals[symbol] = interval
+            _interval_cache_ts = time.time()
+            # keep legacy alias pointing at the most-negative symbol's interval
+            cached_interval = cached_intervals.get(most_negative_symbol)
     except Exception as e:
         logging.error(f"Failed to fetch funding rate info: {e}")
-    return None
-
-
-def _fetch_and_cache_interval(client, symbol: str) -> None:
-    global cached_interval, cached_intervals
-    interval = _get_funding_interval(client, symbol)
-    if interval is not None:
-        cached_intervals[symbol] = interval
-        # keep legacy alias pointing at the most-negative symbol's interval
-        if symbol == most_negative_symbol:
-            cached_interval = interval
+    finally:
+        _refresh_in_flight = False
 
 
 async def start_funding_rate_stream(client):
+    global _loop, _shared_conn
+    _loop = asyncio.get_running_loop()
     try:
         streams_connection = await client.websocket_streams.create_connection()
+        _shared_conn = streams_connection
         logging.info("Subscribing to mark price stream for all markets...")
         funding_stream = await streams_connection.mark_price_stream_for_all_market()
         funding_stream.on("message", lambda data: _handle_mark_price(client, data))
@@ -65,40 +95,67 @@ async def start_funding_rate_stream(client):
 
 
 def _handle_mark_price(client, data):
-    global cached_interval, _last_print_minute, _last_refresh_minute, most_negative_symbol
-
-    for entry in (data if isinstance(data, list) else [data]):
-        symbol = getattr(entry, "s", None)
-        rate   = getattr(entry, "r", None)
+    global cached_interval, _last_print_minute, _last_refresh_minute
+    global most_negative_symbol, most_negative_rate, _refresh_in_flight
+
+    _fr    = funding_rates   # local binding — skip the global lookup per entry
+    rescan = False
+    for entry in (data if isinstance(data, list) else (data,)):
+        try:
+            symbol, rate = _get_sr(entry)
+        except AttributeError:
+            continue
         if symbol and rate is not None:
-            funding_rates[symbol] = float(rate)
+            r = float(rate)
+            _fr[symbol] = r
+            if r < FUNDING_RATE_THRESHOLD:
+                _qualifying.add(symbol)
+            else:
+                _qualifying.discard(symbol)
+            if r < most_negative_rate:
+                most_negative_rate, most_negative_symbol = r, symbol
+            elif symbol == most_negative_symbol and r > most_negative_rate:
+                rescan = True   # current minimum moved up — needs a full pass
 
     if not funding_rates:
         return
 
-    most_negative_symbol = min(funding_rates, key=funding_rates.get)
-    most_negative_rate   = funding_rates[most_negative_symbol]
+    if rescan:
+        most_negative_symbol = min(funding_rates, key=funding_rates.get)
+        most_negative_rate   = funding_rates[most_negative_symbol]
     now            = datetime.datetime.now()
     current_minute = now.minute
     current_hour   = now.hour
 
-    # Refresh intervals for all qualifying symbols that we haven't cached yet,
-    # or at the periodic refresh window (xx:50).
+    # Refresh the whole interval cache in one REST call when it is stale,
+    # missing a qualifying symbol, or at the periodic refresh window (xx:50).
     periodic_refresh = (current_minute == 50 and _last_refresh_minute != (current_hour, 50))
     if periodic_refresh:
         _last_refresh_minute = (current_hour, 50)
 
-    for symbol in qualifying_symbols():
-        if symbol not in cached_intervals or periodic_refresh:
-            asyncio.get_event_loop().run_in_executor(None, _fetch_and_cache_interval, client, symbol)
+    stale   = (time.time() - _interval_cache_ts) > _INTERVAL_CACHE_TTL
+    missing = any(s not in cached_intervals for s in qualifying_symbols())
+    if (periodic_refresh or stale or missing) and not _refresh_in_flight and _loop is not None:
+        _refresh_in_flight = True
+        # The SDK REST call is blocking — run it on a worker thread, scheduled
+        # onto the captured loop thread-safely (the callback may be off-loop).
+        _loop.call_soon_threadsafe(
+            lambda: _loop.create_task(asyncio.to_thread(_refresh_interval_cache, client))
+        )
 
     # Keep legacy cached_interval in sync
     cached_interval = cached_intervals.get(most_negative_symbol)
 
     if _last_print_minute != current_minute:
         _last_print_minute = current_minute
-        if len(funding_rates) > 100:   # wait until we have a meaningful snapshot
-            print_qualifying_funding_rates(funding_rates, cached_intervals, FUNDING_RATE_THRESHOLD)
+        if len(funding_rates) > 100 and _loop is not None:   # wait until we have a meaningful snapshot
+            # Sort/format off the WS callback: snapshot the dicts and hand
+            # the work to the loop, keeping the tick handler on the hot path.
+            fr_snapshot  = funding_rates.copy()
+            int_snapshot = cached_intervals.copy()
+            _loop.call_soon_threadsafe(
+                print_qualifying_funding_rates, fr_snapshot, int_snapshot, FUNDING_RATE_THRESHOLD
+            )
 
 
 async def run_logging_session(client, target_symbol: str, duration: int) -> None:
@@ -108,26 +165,44 @@ async def run_logging_session(client, target_symbol: str, duration: int) -> None
     rate_log_str = f"{current_rate:.8f}" if current_rate is not None else 'unknown'
     interval     = cached_intervals.get(target_symbol, cached_interval)
     log_filename = os.path.join("Logs", f"log_{target_symbol}_{timestamp}_fr{rate_str}.txt")
-    logger, listener = setup_async_logger(log_filename)
-    listener.start()
-
-    logger.info(f"Starting latency logging for {target_symbol} | funding_rate={rate_log_str} | interval={interval}h | duration={duration}s")
 
-    book_ticker = None
+    logger = listener = book_ticker = None
     try:
-        streams_connection = await client.websocket_streams.create_connection()
-        book_ticker = await streams_connection.individual_symbol_book_ticker_streams(symbol=target_symbol)
-        book_ticker.on("message", lambda data: capture_stream_record(logger, getattr(data, "E", 0), data))
+        global _shared_conn
+        if _shared_conn is None:
+            # Standalone use — no funding stream has opened the connection yet
+            _shared_conn = await client.websocket_streams.create_connection()
+
+        # Overlap the disk work (makedirs + log file open) with the WS
+        # subscribe round trip — with N symbols fanned out at once the
+        # session start cost drops to max(setup, subscribe).
+        async with asyncio.TaskGroup() as tg:
+            t_log = tg.create_task(asyncio.to_thread(setup_async_logger, log_filename))
+            t_sub = tg.create_task(_shared_conn.individual_symbol_book_ticker_streams(symbol=target_symbol))
+        logger, listener = t_log.result()
+        book_ticker      = t_sub.result()
+        listener.start()
+
+        logger.info(f"Starting latency logging for {target_symbol} | funding_rate={rate_log_str} | interval={interval}h | duration={duration}s")
+        # Session loggers are always INFO — bind the recorder once and let
+        # ticks go straight to it with no per-message level check.
+        book_ticker.on("message", make_stream_recorder(logger))
 
         await asyncio.sleep(duration)
     except Exception as e:
-        logger.error(f"Error in logging session: {e}")
+        (logger or logging).error(f"Error in logging session: {e}")
     finally:
         if book_ticker:
             try:
                 await book_ticker.unsubscribe()
             except Exception:
                 pass
-        logger.info("Session ended. Running analysis...")
-        listener.stop()
-        subprocess.Popen([sys.executable, "analyze_latency.py", log_filename])
+        if logger:
+            logger.info("Session ended. Running analysis...")
+        if listener:
+            listener.stop()
+        # Run the analysis in-process on a worker thread — no interpreter
+        # re-spawn or module re-import per session. Imported lazily so the
+        # live path never pays for numpy unless a session actually ends.
+        import analyze_latency
+        asyncio.create_task(asyncio.to_thread(analyze_latency._process_one, log_filename))
@@ -1,5 +1,4 @@
 import asyncio
-import configparser
 import datetime
 import json
 import logging
@@ -14,15 +13,27 @@ from binance_common.constants import (
 )
 from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import DerivativesTradingUsdsFutures
 
-from utils import setup_async_logger
+from utils import setup_async_logger, get_config
+
+# Optional: uvloop lowers per-event overhead on the user-data stream
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+# Optional: orjson's C encoder beats json.dumps by a wide margin per event
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
 )
 
-config = configparser.ConfigParser()
-config.read("config.ini")
+config = get_config()
 
 api_key     = config.get("live_auth", "api_key")
 private_key = config.get("live_auth", "private_key")
@@ -42,11 +53,26 @@ _stream_logger = None
 
 
 def handle_user_data(data):
+    # Prefer the raw inbound frame when the SDK exposes it — that skips the
+    # pydantic → dict → JSON round trip entirely.
+    raw_frame = getattr(data, "__raw_bytes__", None)
+    if isinstance(raw_frame, (bytes, bytearray)):
+        msg = raw_frame.decode()
+        logging.info(f"User data event:\n{msg}")
+        if _stream_logger:
+            _stream_logger.info(f"User data event:\n{msg}")
+        return
+
     raw = data if isinstance(data, dict) else data.model_dump(by_alias=True)
-    msg = json.dumps(raw, indent=2)
+    if orjson is not None:
+        msg      = orjson.dumps(raw, option=orjson.OPT_INDENT_2).decode()
+        file_msg = orjson.dumps(raw).decode()   # file log is machine-read — skip the indent work
+    else:
+        msg      = json.dumps(raw, indent=2)
+        file_msg = json.dumps(raw)
     logging.info(f"User data event:\n{msg}")
     if _stream_logger:
-        _stream_logger.info(f"User data event:\n{msg}")
+        _stream_logger.info(f"User data event:\n{file_msg}")
 
 
 async def keepalive_loop(api_connection):
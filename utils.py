@@ -1,67 +1,326 @@
+import collections
+import configparser
+import functools
 import os
 import logging
 import logging.handlers
 import queue
+import sys
+import threading
+import time
 import datetime
 
+# None of the log formats reference caller, thread or process fields, so
+# short-circuit the sys._getframe stack walk and thread/process lookups
+# that LogRecord.__init__ would otherwise do on every remaining stdlib
+# logging call (the stream path's specialized records already skip them).
+logging.logThreads          = False
+logging.logProcesses        = False
+logging.logMultiprocessing  = False
+logging._srcfile            = None
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> configparser.ConfigParser:
+    """Parse config.ini once per process and share the result."""
+    config = configparser.ConfigParser()
+    config.read("config.ini")
+    return config
+
+
+class _DequeQueue:
+    """SimpleQueue-compatible shim over collections.deque.
+
+    deque.append/popleft are lock-free (GIL-atomic), so producers on the hot
+    stream path skip the per-message lock cycle SimpleQueue pays; the Event
+    only comes into play when the single consumer thread finds the deque
+    empty and has to park.
+
+    If a consumer stalls (slow terminal, hung disk), an unbounded queue
+    would pin every queued record in memory. With `maxlen` set, the oldest
+    items are dropped instead and the consumer is handed a one-line
+    "[log dropped N records]" marker once it catches up.
+    """
+
+    def __init__(self, maxlen: int | None = None):
+        self._d       = collections.deque()
+        self._ev      = threading.Event()
+        self._maxlen  = maxlen
+        self._dropped = 0
+
+    def put(self, item):
+        d = self._d
+        if self._maxlen is not None and len(d) >= self._maxlen:
+            d.popleft()
+            self._dropped += 1
+        d.append(item)
+        self._ev.set()
+
+    put_nowait = put
+
+    def get(self, block=True):
+        d = self._d
+        while True:
+            if self._dropped:
+                n, self._dropped = self._dropped, 0
+                return f"[log dropped {n} records]"
+            try:
+                return d.popleft()
+            except IndexError:
+                if not block:
+                    raise queue.Empty from None
+                self._ev.wait()
+                self._ev.clear()
+
+    def empty(self) -> bool:
+        return not self._d
+
+
 # ---------------------------------------------------------------------------
 # Shared async-safe console logger
 # ---------------------------------------------------------------------------
 # One queue + listener for all console output so nothing blocks the event loop.
 
-_console_queue    = queue.SimpleQueue()
-_console_handler  = logging.StreamHandler()
-_console_handler.setFormatter(logging.Formatter('%(message)s'))
+# Cap chosen so a full buffer is tens of MB, not unbounded growth
+_LOG_QUEUE_MAXLEN = 100_000
+
+_console_queue = _DequeQueue(maxlen=_LOG_QUEUE_MAXLEN)
 
-console_listener = logging.handlers.QueueListener(
-    _console_queue,
-    _console_handler,
-    respect_handler_level=True,
-)
 
-_console_logger = logging.getLogger("console")
-_console_logger.setLevel(logging.INFO)
-_console_logger.propagate = False
-_console_logger.addHandler(logging.handlers.QueueHandler(_console_queue))
+class _ConsoleListener:
+    """Minimal drain for the console queue.
+
+    QueueHandler.prepare formats records on the producer side, so by the
+    time an item crosses the thread it is (or carries) the final output
+    line — the consumer just writes it, with no Handler/Formatter
+    machinery per message. Accepts bare strings too.
+    """
+
+    def __init__(self, q):
+        self.queue   = q
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._monitor, name="console-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _monitor(self) -> None:
+        q      = self.queue
+        stream = sys.stderr   # where StreamHandler wrote before
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            if not isinstance(item, str):
+                item = item.getMessage()
+            stream.write(item + "\n")
+            if q.empty():
+                stream.flush()
+
+
+console_listener = _ConsoleListener(_console_queue)
 
 
 def aprint(msg: str) -> None:
-    """Non-blocking print — enqueues the message for the background console thread."""
-    _console_logger.info(msg)
+    """Non-blocking print — enqueues the message for the background console thread.
 
+    The string goes straight onto the queue; no Logger/Handler machinery
+    runs on the calling thread.
+    """
+    _console_queue.put(msg)
 
-def setup_logger(log_filename: str) -> logging.Logger:
-    """Creates a logger that writes to both the given log file and the console."""
-    logger = logging.getLogger(log_filename)
-    logger.setLevel(logging.INFO)
 
-    if not logger.handlers:
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+class _FastFormatter(logging.Formatter):
+    """Formatter whose %(asctime)s caches the strftime result per second.
 
-        os.makedirs(os.path.dirname(log_filename), exist_ok=True)
-        file_handler = logging.FileHandler(log_filename)
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(formatter)
+    At stream rates thousands of records share the same timestamp second,
+    so one strftime per second replaces one per record. Output matches the
+    default asctime format ('%Y-%m-%d %H:%M:%S,mmm').
+    """
 
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(formatter)
+    _last_s   = -1
+    _last_str = ""
+
+    def formatTime(self, record, datefmt=None):
+        s = int(record.created)
+        if s != self._last_s:
+            self._last_s   = s
+            self._last_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(s))
+        return f"{self._last_str},{int(record.msecs):03d}"
+
+    def format(self, record):
+        # Stream records arrive with msg/args unmerged (the data repr is
+        # deliberately deferred to this thread). Merge once and drop the
+        # args so the second handler formatting the same record reuses it.
+        if record.args:
+            record.msg  = record.getMessage()
+            record.args = None
+        return super().format(record)
+
+
+class _BufferedFileHandler(logging.Handler):
+    """File handler that batches formatted lines into one write per flush.
+
+    FileHandler issues a write+flush syscall pair per record, which becomes
+    the bottleneck at stream rates. This handler accumulates encoded lines
+    and flushes with a single os.write when 256 KiB is buffered or 50 ms
+    has passed since the last flush; flush()/close() force the rest out.
+    Only the listener thread ever emits, so no extra locking is needed.
+    """
 
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+    _FLUSH_BYTES = 256 * 1024
+    _FLUSH_AGE   = 0.05   # seconds
+
+    def __init__(self, filename: str):
+        super().__init__()
+        self._fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._chunks: list[bytes] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            data = (self.format(record) + "\n").encode("utf-8")
+        except Exception:
+            self.handleError(record)
+            return
+        self._chunks.append(data)
+        self._size += len(data)
+        now = time.monotonic()
+        if self._size >= self._FLUSH_BYTES or now - self._last_flush >= self._FLUSH_AGE:
+            self._write_out(now)
+
+    # writev submits the chunk list as one iovec — no join copy, one
+    # syscall per IOV_MAX-sized slice. Absent (e.g. Windows), join + write.
+    _IOV_MAX = 1024
+
+    def _write_out(self, now: float | None = None) -> None:
+        if self._chunks:
+            chunks, self._chunks, self._size = self._chunks, [], 0
+            if hasattr(os, "writev"):
+                for i in range(0, len(chunks), self._IOV_MAX):
+                    os.writev(self._fd, chunks[i:i + self._IOV_MAX])
+            else:
+                os.write(self._fd, b"".join(chunks))
+        self._last_flush = now if now is not None else time.monotonic()
+
+    def flush(self):
+        self._write_out()
+
+    def close(self):
+        try:
+            self._write_out()
+            os.close(self._fd)
+        finally:
+            super().close()
 
-    return logger
 
+# ---------------------------------------------------------------------------
+# Shared session listener
+# ---------------------------------------------------------------------------
+# One queue + one background thread serve every logging session. Sessions
+# attach/detach their file handler on the running listener instead of each
+# spawning (and later joining) a thread of their own — with N symbols fanned
+# out at a settlement boundary that saves N thread start/stops per minute.
+
+class _BatchQueueListener(logging.handlers.QueueListener):
+    """QueueListener that also accepts lists of records (stream batches)."""
+
+    def handle(self, record):
+        if isinstance(record, list):
+            for rec in record:
+                super().handle(rec)
+                # Nothing holds a stream record after it is written —
+                # recycle it for the producer instead of leaving it to GC.
+                # Drop the message/data references first so a pooled record
+                # pins a few empty slots, not a formatted line or payload.
+                rec.msg = rec.args = rec.message = None
+                _record_pool.append(rec)
+        elif isinstance(record, threading.Event):
+            record.set()   # drain marker — everything queued before it is written
+        elif isinstance(record, str):
+            # overflow marker from the bounded queue
+            ns = time.time_ns()
+            super().handle(_FastRecord(
+                "log", record, None, ns / 1_000_000_000, (ns // 1_000_000) % 1000,
+            ))
+        else:
+            super().handle(record)
+
+
+_session_queue    = _DequeQueue(maxlen=_LOG_QUEUE_MAXLEN)
+_session_listener = _BatchQueueListener(
+    _session_queue,
+    respect_handler_level=True,
+)
+_session_console = logging.StreamHandler()
+_session_console.setLevel(logging.INFO)
+_session_console.setFormatter(_FastFormatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+# The listener thread lives for the whole process; sessions only ever
+# attach and detach handlers on it.
+_session_listener.start()
+
+
+# Loggers already wired to the session queue, keyed by log path
+_session_loggers: dict[str, logging.Logger] = {}
+
+# Directories already ensured this process — skips the stat syscall
+# os.makedirs(exist_ok=True) pays on every repeat call
+_dirs_created: set[str] = set()
+
+
+def _ensure_dir(path: str) -> None:
+    if path and path not in _dirs_created:
+        os.makedirs(path, exist_ok=True)
+        _dirs_created.add(path)
+
+
+class _SessionListenerHandle:
+    """Per-session stand-in for a QueueListener.
 
-def setup_async_logger(log_filename: str) -> tuple[logging.Logger, logging.handlers.QueueListener]:
+    start() attaches the session's file handler to the shared listener;
+    stop() detaches it and flushes/closes the file. The shared listener
+    thread itself keeps running across sessions.
+    """
+
+    def __init__(self, file_handler: logging.Handler):
+        self._file_handler = file_handler
+
+    def start(self) -> None:
+        # Reassign the tuple atomically — the listener thread reads
+        # self.handlers per record, never mutates it.
+        _session_listener.handlers = _session_listener.handlers + (self._file_handler,)
+
+    def stop(self) -> None:
+        _flush_pending()   # push any buffered stream records before detaching
+        # Wait until the listener has written everything queued so far —
+        # detaching earlier would close the file under in-flight records.
+        drained = threading.Event()
+        _session_queue.put(drained)
+        drained.wait(timeout=5)
+        _session_listener.handlers = tuple(
+            h for h in _session_listener.handlers if h is not self._file_handler
+        )
+        self._file_handler.flush()
+        self._file_handler.close()
+
+
+def setup_async_logger(log_filename: str) -> tuple[logging.Logger, _SessionListenerHandle]:
     """
     Creates a high-throughput logger for stream sessions.
 
     The returned logger uses a QueueHandler so that calls to logger.info()
     on the asyncio event loop return instantly — actual disk/console writes
-    happen on a dedicated background thread via QueueListener.
-
-    Call  listener.stop()  when the session ends to flush and shut down.
+    happen on a shared background thread. The returned handle mimics a
+    QueueListener: start() attaches the session's file handler, stop()
+    detaches it and flushes the file.
 
     Usage:
         logger, listener = setup_async_logger(path)
@@ -69,66 +328,143 @@ def setup_async_logger(log_filename: str) -> tuple[logging.Logger, logging.handl
         ...
         listener.stop()
     """
-    os.makedirs(os.path.dirname(log_filename), exist_ok=True)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    _ensure_dir(os.path.dirname(log_filename))
+    formatter = _FastFormatter('%(asctime)s - %(levelname)s - %(message)s')
 
-    file_handler = logging.FileHandler(log_filename)
+    file_handler = _BufferedFileHandler(log_filename)
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
+    # Route this session's records to its own file only
+    file_handler.addFilter(lambda record, _name=log_filename: record.name == _name)
 
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
+    if _session_console not in _session_listener.handlers:
+        _session_listener.handlers = _session_listener.handlers + (_session_console,)
 
-    log_queue    = queue.SimpleQueue()
-    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Configure each logger once; repeat sessions on the same path reuse it
+    # without re-entering the logging module's registry lock.
+    logger = _session_loggers.get(log_filename)
+    if logger is None:
+        logger = logging.getLogger(log_filename)
+        logger.setLevel(logging.INFO)
+        logger.handlers.clear()
+        logger.addHandler(logging.handlers.QueueHandler(_session_queue))
+        logger.propagate = False
+        _session_loggers[log_filename] = logger
+
+    return logger, _SessionListenerHandle(file_handler)
 
-    listener = logging.handlers.QueueListener(
-        log_queue,
-        file_handler,
-        console_handler,
-        respect_handler_level=True,
-    )
 
-    logger = logging.getLogger(log_filename)
-    logger.setLevel(logging.INFO)
-    logger.handlers.clear()
-    logger.addHandler(queue_handler)
-    logger.propagate = False
+# Caller/thread/process identity is constant for the stream path — resolved
+# once here instead of per record inside LogRecord.__init__.
+_THREAD_ID    = threading.get_ident()
+_PROCESS_ID   = os.getpid()
+_PROCESS_NAME = "MainProcess"
 
-    return logger, listener
 
+class _FastRecord(logging.LogRecord):
+    """Minimal INFO-level record for the per-tick stream path.
 
-def capture_stream_record(logger: logging.Logger, event_time_ms: int, data: object) -> None:
+    LogRecord.__init__ resolves pathname/module, thread and process ids and
+    multiprocessing state on every call — all invariant or unused here, so
+    this constructor just assigns the handful of fields the queue handler,
+    filters and formatter actually read.
     """
-    Stamp the log record with the exact wall-clock time of arrival
-    (before any processing), then enqueue it for background writing.
 
-    The formatter's %(asctime)s will reflect this captured time, not
-    the time the background thread eventually writes to disk.
+    def __init__(self, name: str, msg: str, args, created: float, msecs: float):
+        self.name            = name
+        self.levelno         = logging.INFO
+        self.levelname       = "INFO"
+        self.msg             = msg
+        self.args            = args
+        self.exc_info        = None
+        self.exc_text        = None
+        self.stack_info      = None
+        self.created         = created
+        self.msecs           = msecs
+        self.relativeCreated = 0.0
+        self.pathname        = ""
+        self.filename        = ""
+        self.module          = ""
+        self.funcName        = ""
+        self.lineno          = 0
+        self.thread          = _THREAD_ID
+        self.threadName      = None
+        self.process         = _PROCESS_ID
+        self.processName     = _PROCESS_NAME
+        self.taskName        = None
+
+
+# Written-out stream records come back here for reuse; the cap bounds how
+# much record memory a burst can leave behind.
+_record_pool: collections.deque = collections.deque(maxlen=4096)
+
+# Stream records are buffered and pushed onto the queue as one list per
+# batch — one queue handoff per ~64 ticks instead of one per tick. The
+# time cap bounds how stale a quiet stream's records can get.
+_pending: list[logging.LogRecord] = []
+_BATCH_MAX     = 64
+_BATCH_MAX_AGE = 0.05   # seconds
+_last_flush    = time.monotonic()
+
+
+def _flush_pending() -> None:
+    global _pending, _last_flush
+    if _pending:
+        batch, _pending = _pending, []
+        _session_queue.put(batch)
+    _last_flush = time.monotonic()
+
+
+def make_stream_recorder(logger: logging.Logger):
     """
-    arrival_ms = datetime.datetime.now().timestamp() * 1000
-    record = logging.LogRecord(
-        name    = logger.name,
-        level   = logging.INFO,
-        pathname= "",
-        lineno  = 0,
-        msg     = f"Stream message: {data}",
-        args    =(),
-        exc_info= None,
-    )
-    # Override created/msecs so %(asctime)s reflects true arrival time
-    record.created = arrival_ms / 1000
-    record.msecs   = arrival_ms % 1000
-    logger.handle(record)
+    Build the per-tick record function for a logging session.
+
+    The returned callable stamps each message with the exact wall-clock
+    time of arrival (before any processing) and buffers it for background
+    writing. The message stays an unformatted "%s" + args pair so the SDK
+    model's __repr__ runs on the listener thread, not in the WS callback,
+    and %(asctime)s reflects the captured time rather than write time.
+
+    The logger's name and the clock function are bound into the closure
+    once per session instead of being looked up per tick.
+    """
+    name     = logger.name
+    time_ns  = time.time_ns
+    pool_pop = _record_pool.pop
+
+    def record_stream(data: object) -> None:
+        ns = time_ns()   # integer clock read — no datetime allocation per tick
+        try:
+            rec = pool_pop()
+        except IndexError:
+            rec = _FastRecord.__new__(_FastRecord)
+        rec.__init__(
+            name,
+            "Stream message: %s",
+            (data,),
+            ns / 1_000_000_000,
+            (ns // 1_000_000) % 1000,
+        )
+        _pending.append(rec)
+        if len(_pending) >= _BATCH_MAX or time.monotonic() - _last_flush > _BATCH_MAX_AGE:
+            _flush_pending()
+
+    return record_stream
 
 
 def print_qualifying_funding_rates(funding_rates: dict, cached_intervals: dict, threshold: float) -> None:
     """Prints all symbols whose funding rate is below the threshold, sorted by rate ascending."""
-    qualifying = sorted(
-        [(s, r) for s, r in funding_rates.items() if r < threshold],
-        key=lambda x: x[1]
-    )
+    import numpy as np   # deferred — the hot stream paths never need it
+
+    # C-level filter + argsort instead of a Python comprehension and
+    # per-element comparisons; matters once hundreds of symbols qualify.
+    n       = len(funding_rates)
+    symbols = np.fromiter(funding_rates.keys(), dtype=object, count=n)
+    rates   = np.fromiter(funding_rates.values(), dtype=np.float64, count=n)
+    mask    = rates < threshold
+    q_rates = rates[mask]
+    order   = np.argsort(q_rates, kind="stable")
+    qualifying = list(zip(symbols[mask][order], q_rates[order]))
 
     now       = datetime.datetime.now()
     next_hour = (now.hour + 1) % 24
@@ -137,15 +473,21 @@ def print_qualifying_funding_rates(funding_rates: dict, cached_intervals: dict,
         aprint(f"[Funding Rates] No symbols below threshold ({threshold})")
         return
 
-    lines = [f"[Funding Rates < {threshold}]  ({len(qualifying)} symbols)  {now.strftime('%H:%M:%S')}"]
-    for symbol, rate in qualifying:
-        interval = cached_intervals.get(symbol)
-        if interval is not None:
-            settlement_hours = set(range(0, 24, interval))
-            settling = " ⚡" if next_hour in settlement_hours else ""
-            interval_str = f"{interval}h"
-        else:
-            settling     = ""
-            interval_str = "?h"
-        lines.append(f"  {symbol:<20} {rate:+.8f}  [{interval_str}]{settling}")
-    aprint("\n".join(lines))
+    # An interval settles at every hour divisible by it — one modulo per
+    # distinct interval instead of rebuilding a set of hours per symbol.
+    settle_by_interval = {
+        iv: next_hour % iv == 0 for iv in set(cached_intervals.values()) if iv
+    }
+
+    # Bound methods hoisted out of the loop; lines stream straight into one
+    # join instead of growing an intermediate list.
+    get_interval = cached_intervals.get
+    get_settle   = settle_by_interval.get
+    header = f"[Funding Rates < {threshold}]  ({len(qualifying)} symbols)  {now.strftime('%H:%M:%S')}"
+    body = "\n".join(
+        f"  {symbol:<20} {rate:+.8f}  [{interval}h]{' ⚡' if get_settle(interval) else ''}"
+        if (interval := get_interval(symbol)) is not None
+        else f"  {symbol:<20} {rate:+.8f}  [?h]"
+        for symbol, rate in qualifying
+    )
+    aprint(header + "\n" + body)